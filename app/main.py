@@ -17,10 +17,12 @@ def create_app():
             supabase_key=os.getenv('SUPABASE_KEY')
         )
 
-    from app.routes import auth, dashboard, laboratorio, api
+    from app.routes import auth, dashboard, laboratorio, api, profiling
     app.register_blueprint(auth.bp)
     app.register_blueprint(dashboard.bp)
     app.register_blueprint(laboratorio.bp)
     app.register_blueprint(api.bp)
+    # Profiling opcional por petición (PROFILING_MODE + PROFILING_TOKEN)
+    app.register_blueprint(profiling.bp)
     
     return app
\ No newline at end of file
@@ -1,6 +1,6 @@
 from supabase import create_client, Client
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 import os
 
 class SupabaseRepository:
@@ -52,6 +52,73 @@ class SupabaseRepository:
             print(f"Error al obtener historial: {e}")
             return []
     
+    def listar_instrumentos(self, desde_id: Optional[int] = None, batch_size: int = 1000) -> List[Dict]:
+        """Obtiene id/codigo/instrumento de todas las calibraciones (opcionalmente solo las de id > `desde_id`)"""
+        filas = []
+        offset = 0
+        try:
+            while True:
+                query = self.client.table('historicos') \
+                    .select('id, codigo, instrumento')
+                if desde_id is not None:
+                    query = query.gt('id', desde_id)
+                response = query \
+                    .order('id', desc=False) \
+                    .range(offset, offset + batch_size - 1) \
+                    .execute()
+
+                rows = response.data
+                if not rows: break
+                filas.extend(rows)
+                if len(rows) < batch_size: break
+                offset += batch_size
+
+            return filas
+        except Exception as e:
+            # Sin resultados parciales: una reconstrucción completa no debe perder instrumentos
+            print(f"Error al listar instrumentos: {e}")
+            raise
+
+    def iterar_historicos(self, columnas: str = '*', desde_codigo: Optional[str] = None, batch_size: int = 1000) -> Iterator[List[Dict]]:
+        """Recorre 'historicos' por páginas, ordenado por código y fecha (omite filas sin código)"""
+        offset = 0
+        while True:
+            query = self.client.table('historicos') \
+                .select(columnas) \
+                .not_.is_('codigo', 'null')
+            if desde_codigo:
+                query = query.gt('codigo', desde_codigo)
+            response = query \
+                .order('codigo', desc=False) \
+                .order('fecha_calibracion', desc=False) \
+                .order('id', desc=False) \
+                .range(offset, offset + batch_size - 1) \
+                .execute()
+
+            rows = response.data
+            if not rows: break
+            yield rows
+            if len(rows) < batch_size: break
+            offset += batch_size
+
+    def guardar_predicciones(self, filas: List[Dict], chunk_size: int = 500) -> int:
+        """
+        Actualiza prediccion_ia/fecha_estimada por id con un UPDATE masivo por bloques
+        (función SQL 'actualizar_predicciones', ver sql/actualizar_predicciones.sql).
+        Devuelve cuántas filas existían y se actualizaron.
+        """
+        columnas = ('id', 'prediccion_ia', 'fecha_estimada')
+        actualizadas = 0
+        try:
+            for i in range(0, len(filas), chunk_size):
+                chunk = [{c: fila[c] for c in columnas} for fila in filas[i:i + chunk_size]]
+                response = self.client.rpc('actualizar_predicciones', {'filas': chunk}).execute()
+                actualizadas += int(response.data or 0)
+            return actualizadas
+        except Exception as e:
+            print(f"Error al guardar predicciones: {e}")
+            raise
+
     def extraer_features(self, instrumento: Dict, codigo: str) -> Dict:
         """Extrae las features necesarias para el modelo"""
         try:
@@ -1 +1 @@
-from . import auth, dashboard, laboratorio, api
\ No newline at end of file
+from . import auth, dashboard, laboratorio, api, profiling
\ No newline at end of file
@@ -5,6 +5,7 @@ from dotenv import load_dotenv
 from app.repositories.supabase_repository import SupabaseRepository
 from app.services.prediction_service import PredictionService
 from app.services.feature_engineering import FeatureEngineering
+from app.services.instrument_index import InstrumentIndex
 
 load_dotenv()
 
@@ -13,6 +14,7 @@ bp = Blueprint("laboratorio", __name__, url_prefix="/laboratorio")
 # Inicializar servicios
 prediction_service = PredictionService()
 supabase_repository = SupabaseRepository()
+indice_instrumentos = InstrumentIndex(supabase_repository)
 
 @bp.route("/")
 def index():
@@ -23,6 +25,21 @@ def index():
         supabase_key=os.getenv('SUPABASE_KEY', '')
     )
 
+@bp.route("/sugerir")
+def sugerir_instrumentos():
+    """Autocompletado de código/nombre servido desde el índice en memoria (sin consulta por tecla)"""
+    try:
+        consulta = request.args.get('q', '')
+        limite = min(max(request.args.get('limite', 10, type=int), 1), 50)
+
+        # La primera petición lanza la carga inicial (después del fork de los workers, no al importar)
+        indice_instrumentos.refrescar_en_segundo_plano()
+        return jsonify({'sugerencias': indice_instrumentos.buscar(consulta, limite)})
+
+    except Exception as e:
+        print(f"❌ Error Sugerencias: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @bp.route("/buscar", methods=["POST"])
 def buscar_instrumento():
     try:
@@ -0,0 +1,116 @@
+import hmac
+import os
+import random
+import tempfile
+import time
+from flask import Blueprint, request, jsonify, g, send_from_directory
+from dotenv import load_dotenv
+from app.services.profiling_service import CProfileRecorder, SamplingRecorder, ProfileStore
+
+load_dotenv()
+
+bp = Blueprint("profiling", __name__, url_prefix="/profiling")
+
+def _float_env(nombre, default):
+    """Lee una variable numérica; un valor inválido no debe impedir arrancar la app."""
+    valor = os.getenv(nombre)
+    if valor is None:
+        return default
+    try:
+        return float(valor)
+    except ValueError:
+        print(f"⚠ {nombre}={valor!r} no es un número, se usa {default}")
+        return default
+
+# Configuración (desactivado salvo que se definan PROFILING_MODE y PROFILING_TOKEN)
+modo = os.getenv('PROFILING_MODE', 'off').lower()          # off | cprofile | sampling
+token = os.getenv('PROFILING_TOKEN', '')
+sample_rate = _float_env('PROFILING_SAMPLE_RATE', 0.0)
+intervalo_ms = _float_env('PROFILING_INTERVAL_MS', 5.0)
+directorio = os.getenv('PROFILING_DIR', os.path.join(tempfile.gettempdir(), 'web-pag-profiles'))
+
+habilitado = modo in ('cprofile', 'sampling') and bool(token)
+store = ProfileStore(directorio) if habilitado else None
+
+def _token_valido(valor):
+    # Comparar bytes: compare_digest lanza TypeError con str no ASCII
+    return bool(valor) and hmac.compare_digest(valor.encode(), token.encode())
+
+def _debe_perfilar():
+    if request.path.startswith(('/profiling', '/static')):
+        return False
+    if _token_valido(request.headers.get('X-Profile-Token', '')):
+        return True
+    return sample_rate > 0 and random.random() < sample_rate
+
+def _parametros():
+    """Query string y cuerpo JSON de la petición (valores recortados)."""
+    parametros = dict(request.args)
+    body = request.get_json(silent=True)
+    if isinstance(body, dict):
+        parametros.update({k: str(v)[:200] for k, v in body.items()})
+    return parametros
+
+def _finalizar(status):
+    recorder = g.pop('profiler', None)
+    if recorder is None:
+        return
+    duracion_ms = (time.perf_counter() - g.pop('profiler_inicio')) * 1000
+    recorder.detener()
+    try:
+        store.guardar(recorder, {
+            'method': request.method,
+            'path': request.path,
+            'ruta': request.url_rule.rule if request.url_rule else None,
+            'parametros': _parametros(),
+            'status': status,
+            'duracion_ms': round(duracion_ms, 2),
+            'modo': modo,
+            'fecha': time.strftime('%Y-%m-%dT%H:%M:%S')
+        })
+    except Exception as e:
+        print(f"Error guardando perfil: {e}")
+
+@bp.before_app_request
+def iniciar_perfil():
+    if not habilitado or not _debe_perfilar():
+        return
+    recorder = CProfileRecorder() if modo == 'cprofile' else SamplingRecorder(intervalo_ms)
+    if recorder.iniciar():
+        g.profiler = recorder
+        g.profiler_inicio = time.perf_counter()
+
+@bp.after_app_request
+def detener_perfil(response):
+    _finalizar(response.status_code)
+    return response
+
+@bp.teardown_app_request
+def detener_perfil_error(error=None):
+    # Solo cuando la excepción se propaga (PROPAGATE_EXCEPTIONS, modo debug/testing):
+    # en ese caso no se llega a after_request. Si no, handle_exception ya pasó por detener_perfil.
+    _finalizar(500)
+
+@bp.route("/")
+def index():
+    """Perfiles recientes ordenados del más lento al más rápido (token solo por cabecera, no en la URL)"""
+    if not habilitado:
+        return jsonify({'error': 'Profiling desactivado'}), 404
+    if not _token_valido(request.headers.get('X-Profile-Token', '')):
+        return jsonify({'error': 'No autorizado'}), 403
+
+    limite = request.args.get('limite', 20, type=int)
+    return jsonify({'modo': modo, 'perfiles': store.mas_lentos(limite)})
+
+@bp.route("/<perfil_id>")
+def descargar(perfil_id):
+    """Descarga el archivo .prof / .speedscope.json de un perfil"""
+    if not habilitado:
+        return jsonify({'error': 'Profiling desactivado'}), 404
+    if not _token_valido(request.headers.get('X-Profile-Token', '')):
+        return jsonify({'error': 'No autorizado'}), 403
+
+    perfil = store.obtener(perfil_id)
+    if not perfil:
+        return jsonify({'error': 'No encontrado'}), 404
+    return send_from_directory(directorio, perfil['archivo'], as_attachment=True)
@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+import unicodedata
 from datetime import datetime
 
 class FeatureEngineering:
@@ -125,19 +126,21 @@ class FeatureEngineering:
 
         return df
 
+    @staticmethod
+    def limpiar_nombre(t):
+        """
+        Normaliza el nombre de un instrumento (NFC, espacios colapsados, Title Case).
+        """
+        return " ".join(unicodedata.normalize('NFC', str(t)).split()).title()
+
     @staticmethod
     def agrupar_por_tipo(df, usar_ia=False):
         """
         Genera el resumen por tipo de instrumento para el dashboard.
         """
-        import unicodedata
-        
-        def limpiar_nombre(t): 
-            return " ".join(unicodedata.normalize('NFC', str(t)).split()).title()
-
         if df.empty: return []
 
-        df['tipo_final'] = df['instrumento'].apply(limpiar_nombre)
+        df['tipo_final'] = df['instrumento'].apply(FeatureEngineering.limpiar_nombre)
         df['period_db'] = pd.to_numeric(df['periodicidad'], errors='coerce')
 
         # Agrupación base
@@ -0,0 +1,189 @@
+import bisect
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from app.services.feature_engineering import FeatureEngineering
+
+class InstrumentIndex:
+    """
+    Índice en memoria de códigos y nombres de instrumentos para el autocompletado.
+    - Prefijo: lista ordenada de claves (búsqueda binaria).
+    - Difuso: índice invertido de trigramas (fracción de trigramas de la consulta presentes).
+    """
+    TAMANO_NGRAMA = 3
+    SIMILITUD_MINIMA = 0.5
+
+    def __init__(self, repository, intervalo_refresco=300, refrescos_por_reconstruccion=12):
+        self.repository = repository
+        self.intervalo_refresco = intervalo_refresco
+        self.refrescos_por_reconstruccion = refrescos_por_reconstruccion
+        self._refrescos_incrementales = 0
+
+        self._lock = threading.Lock()
+        self._refrescando = threading.Lock()
+        self._entradas = {}                  # codigo -> {'codigo', 'instrumento', 'claves', 'ngramas'}
+        self._claves = []                    # lista ordenada de (clave, codigo)
+        self._ngramas = defaultdict(set)     # ngrama -> {codigo, ...}
+        self._ultimo_id = None
+        self._ultimo_refresco = None
+
+    @staticmethod
+    def normalizar(texto):
+        """
+        Clave de comparación: misma limpieza que el dashboard, sin distinguir mayúsculas ni tildes.
+        """
+        if texto is None:
+            return ""
+        limpio = unicodedata.normalize('NFD', FeatureEngineering.limpiar_nombre(texto).casefold())
+        return "".join(c for c in limpio if not unicodedata.combining(c))
+
+    @classmethod
+    def generar_ngramas(cls, texto):
+        n = cls.TAMANO_NGRAMA
+        relleno = f" {texto} "
+        if len(relleno) <= n:
+            return {relleno}
+        return {relleno[i:i + n] for i in range(len(relleno) - n + 1)}
+
+    def _vigente(self):
+        return self._ultimo_refresco is not None \
+            and time.monotonic() - self._ultimo_refresco < self.intervalo_refresco
+
+    def refrescar(self, forzar=False):
+        """
+        Refresco incremental: trae solo las filas insertadas desde el último refresco
+        (id > último id visto), así también se indexan calibraciones cargadas a posteriori
+        con fecha antigua. Cada `refrescos_por_reconstruccion` refrescos (y en el primero)
+        reconstruye el índice completo para reflejar renombres y códigos eliminados.
+        Si otro hilo ya está refrescando, se sirve el índice actual sin esperar.
+        """
+        if not forzar and self._vigente():
+            return
+        if not self._refrescando.acquire(blocking=False):
+            return
+        try:
+            if self._ultimo_refresco is None or self._refrescos_incrementales >= self.refrescos_por_reconstruccion:
+                self._reconstruir()
+                self._refrescos_incrementales = 0
+            else:
+                filas = self.repository.listar_instrumentos(desde_id=self._ultimo_id)
+                with self._lock:
+                    for fila in filas:
+                        self._registrar(fila)
+                self._refrescos_incrementales += 1
+            self._ultimo_refresco = time.monotonic()
+        except Exception as e:
+            print(f"Error refrescando índice de instrumentos: {e}")
+        finally:
+            self._refrescando.release()
+
+    def _reconstruir(self):
+        """Construye estructuras nuevas con toda la tabla y las intercambia bajo el lock."""
+        nuevo = InstrumentIndex(self.repository)
+        for fila in self.repository.listar_instrumentos():
+            nuevo._registrar(fila)
+
+        with self._lock:
+            self._entradas = nuevo._entradas
+            self._claves = nuevo._claves
+            self._ngramas = nuevo._ngramas
+            self._ultimo_id = nuevo._ultimo_id
+
+    def refrescar_en_segundo_plano(self, forzar=False):
+        """Lanza `refrescar` en un hilo para que las peticiones nunca esperen a la base de datos."""
+        if (not forzar and self._vigente()) or self._refrescando.locked():
+            return
+        threading.Thread(target=self.refrescar, kwargs={'forzar': forzar}, daemon=True).start()
+
+    def _registrar(self, fila):
+        """Inserta o actualiza un instrumento (debe llamarse con el lock tomado)."""
+        fila_id = fila.get('id')
+        if fila_id is not None and (self._ultimo_id is None or fila_id > self._ultimo_id):
+            self._ultimo_id = fila_id
+
+        codigo = str(fila.get('codigo') or '').strip().upper()
+        if not codigo:
+            return
+
+        instrumento = FeatureEngineering.limpiar_nombre(fila['instrumento']) if fila.get('instrumento') else ''
+        previa = self._entradas.get(codigo)
+        if previa and previa['instrumento'] == instrumento:
+            return
+        if previa:
+            self._eliminar(previa)
+
+        claves = {self.normalizar(codigo)}
+        if instrumento:
+            claves.add(self.normalizar(instrumento))
+        ngramas = set()
+        for clave in claves:
+            ngramas |= self.generar_ngramas(clave)
+
+        entrada = {'codigo': codigo, 'instrumento': instrumento, 'claves': claves, 'ngramas': ngramas}
+        self._entradas[codigo] = entrada
+        for clave in claves:
+            bisect.insort(self._claves, (clave, codigo))
+        for ngrama in ngramas:
+            self._ngramas[ngrama].add(codigo)
+
+    def _eliminar(self, entrada):
+        codigo = entrada['codigo']
+        for clave in entrada['claves']:
+            i = bisect.bisect_left(self._claves, (clave, codigo))
+            if i < len(self._claves) and self._claves[i] == (clave, codigo):
+                del self._claves[i]
+        for ngrama in entrada['ngramas']:
+            codigos = self._ngramas.get(ngrama)
+            if codigos is not None:
+                codigos.discard(codigo)
+                if not codigos:
+                    del self._ngramas[ngrama]
+        del self._entradas[codigo]
+
+    def buscar(self, consulta, limite=10):
+        """
+        Devuelve hasta `limite` instrumentos: primero coincidencias por prefijo,
+        luego por similitud de trigramas.
+        """
+        q = self.normalizar(consulta)
+        if not q:
+            return []
+
+        resultados = []
+        vistos = set()
+        with self._lock:
+            # 1. Prefijo (código o nombre)
+            i = bisect.bisect_left(self._claves, (q, ''))
+            while i < len(self._claves) and len(resultados) < limite:
+                clave, codigo = self._claves[i]
+                if not clave.startswith(q):
+                    break
+                if codigo not in vistos:
+                    vistos.add(codigo)
+                    resultados.append(self._respuesta(codigo))
+                i += 1
+
+            # 2. Difuso (trigramas)
+            if len(resultados) < limite:
+                ngramas_q = self.generar_ngramas(q)
+                comunes = defaultdict(int)
+                for ngrama in ngramas_q:
+                    for codigo in self._ngramas.get(ngrama, ()):
+                        if codigo not in vistos:
+                            comunes[codigo] += 1
+
+                candidatos = []
+                for codigo, n in comunes.items():
+                    similitud = n / len(ngramas_q)
+                    if similitud >= self.SIMILITUD_MINIMA:
+                        candidatos.append((-similitud, codigo))
+
+                for _, codigo in sorted(candidatos)[:limite - len(resultados)]:
+                    resultados.append(self._respuesta(codigo))
+
+        return resultados
+
+    def _respuesta(self, codigo):
+        entrada = self._entradas[codigo]
+        return {'codigo': entrada['codigo'], 'instrumento': entrada['instrumento']}
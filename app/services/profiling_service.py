@@ -0,0 +1,185 @@
+import cProfile
+import glob
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+
+class CProfileRecorder:
+    """
+    Perfil determinista (cProfile) del hilo de la petición. Se guarda como .prof (pstats).
+    Solo puede haber uno activo a la vez en el proceso (requisito de cProfile en Python 3.12+).
+    """
+    EXTENSION = ".prof"
+    _activo = threading.Lock()
+
+    def __init__(self):
+        self.profile = None
+
+    def iniciar(self):
+        if not CProfileRecorder._activo.acquire(blocking=False):
+            return False
+        try:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+            return True
+        except ValueError:
+            # Otra herramienta de profiling ya está activa
+            self.profile = None
+            CProfileRecorder._activo.release()
+            return False
+
+    def detener(self):
+        if self.profile is None:
+            return
+        self.profile.disable()
+        CProfileRecorder._activo.release()
+
+    def guardar(self, path):
+        self.profile.dump_stats(path)
+
+
+class SamplingRecorder:
+    """
+    Perfil por muestreo: un hilo auxiliar captura la pila del hilo de la petición
+    cada `intervalo_ms`. Bajo overhead; se guarda en formato speedscope (.speedscope.json).
+    """
+    EXTENSION = ".speedscope.json"
+
+    def __init__(self, intervalo_ms=5.0):
+        self.intervalo = intervalo_ms / 1000
+        self.thread_id = None
+        self.muestras = []      # [(pila como tupla de frames, duración en ms)]
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def iniciar(self):
+        self.thread_id = threading.get_ident()
+        self._hilo = threading.Thread(target=self._muestrear, daemon=True)
+        self._hilo.start()
+        return True
+
+    def _muestrear(self):
+        anterior = time.perf_counter()
+        while not self._detener.wait(self.intervalo):
+            frame = sys._current_frames().get(self.thread_id)
+            ahora = time.perf_counter()
+            if frame is None:
+                break
+            pila = []
+            while frame is not None:
+                code = frame.f_code
+                pila.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            pila.reverse()  # speedscope espera la pila de la raíz a la hoja
+            self.muestras.append((tuple(pila), (ahora - anterior) * 1000))
+            anterior = ahora
+
+    def detener(self):
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+
+    def guardar(self, path, nombre="request"):
+        frames, indices = [], {}
+        samples, weights = [], []
+        for pila, peso in self.muestras:
+            fila = []
+            for frame in pila:
+                if frame not in indices:
+                    indices[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                fila.append(indices[frame])
+            samples.append(fila)
+            weights.append(round(peso, 3))
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "$schema": "https://www.speedscope.app/file-format-schema.json",
+                "shared": {"frames": frames},
+                "profiles": [{
+                    "type": "sampled",
+                    "name": nombre,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": round(sum(weights), 3),
+                    "samples": samples,
+                    "weights": weights
+                }],
+                "name": nombre,
+                "exporter": "web-pag profiling"
+            }, f)
+
+
+class ProfileStore:
+    """
+    Guarda los perfiles en disco junto a un <id>.meta.json con la ruta y los parámetros.
+    El índice se lee siempre de esos archivos, así que lo comparten todos los workers
+    y sobrevive a reinicios; se conservan los `max_perfiles` más recientes del directorio.
+    """
+    SUFIJO_META = ".meta.json"
+    PATRON_ID = re.compile(r"^\d{8}-\d{6}-[0-9a-f]{8}$")
+
+    def __init__(self, directorio, max_perfiles=200):
+        self.directorio = directorio
+        self.max_perfiles = max_perfiles
+        os.makedirs(directorio, exist_ok=True)
+
+    def guardar(self, recorder, metadata):
+        perfil_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        archivo = perfil_id + recorder.EXTENSION
+        path = os.path.join(self.directorio, archivo)
+
+        if isinstance(recorder, SamplingRecorder):
+            recorder.guardar(path, nombre=f"{metadata.get('method')} {metadata.get('path')}")
+        else:
+            recorder.guardar(path)
+
+        # El .meta.json se escribe al final y de forma atómica: si existe, el perfil está completo
+        metadata = dict(metadata, id=perfil_id, archivo=archivo)
+        meta_path = os.path.join(self.directorio, perfil_id + self.SUFIJO_META)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(metadata, f, default=str)
+        os.replace(meta_path + ".tmp", meta_path)
+
+        self._podar()
+        return metadata
+
+    def _ids_en_disco(self):
+        """Ids de los perfiles completos, del más antiguo al más reciente (el id empieza por la fecha)."""
+        patron = os.path.join(self.directorio, "*" + self.SUFIJO_META)
+        return sorted(os.path.basename(p)[:-len(self.SUFIJO_META)] for p in glob.glob(patron))
+
+    def _leer(self, perfil_id):
+        try:
+            with open(os.path.join(self.directorio, perfil_id + self.SUFIJO_META), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # Borrado por otro worker mientras tanto
+            return None
+
+    def _podar(self):
+        ids = self._ids_en_disco()
+        for perfil_id in ids[:max(0, len(ids) - self.max_perfiles)]:
+            # Primero el perfil y después su .meta.json, para no dejar archivos huérfanos sin indexar
+            metadata = self._leer(perfil_id)
+            nombres = [metadata['archivo']] if metadata else []
+            nombres.append(perfil_id + self.SUFIJO_META)
+            for nombre in nombres:
+                try:
+                    os.remove(os.path.join(self.directorio, nombre))
+                except OSError:
+                    pass
+
+    def mas_lentos(self, limite=20):
+        perfiles = [p for p in (self._leer(i) for i in self._ids_en_disco()) if p]
+        return sorted(perfiles, key=lambda p: p['duracion_ms'], reverse=True)[:limite]
+
+    def obtener(self, perfil_id):
+        if not self.PATRON_ID.match(perfil_id):
+            return None
+        return self._leer(perfil_id)
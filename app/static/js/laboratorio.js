@@ -343,9 +343,44 @@ document.addEventListener("DOMContentLoaded", () => {
     });
   }
 
+  // ============================================
+  // AUTOCOMPLETADO (índice en memoria del servidor)
+  // ============================================
+  let sugerenciasTimer = null;
+
+  async function cargarSugerencias(texto) {
+    try {
+      const response = await fetch(
+        `/laboratorio/sugerir?q=${encodeURIComponent(texto)}&limite=10`,
+      );
+      if (!response.ok) return;
+      const { sugerencias } = await response.json();
+
+      const datalist = document.getElementById("sugerenciasInstrumento");
+      datalist.innerHTML = "";
+      sugerencias.forEach(({ codigo, instrumento }) => {
+        const option = document.createElement("option");
+        option.value = codigo;
+        option.label = instrumento;
+        datalist.appendChild(option);
+      });
+    } catch (error) {
+      console.error("Error cargando sugerencias:", error);
+    }
+  }
+
   // ============================================
   // EVENT LISTENERS
   // ============================================
+  document
+    .getElementById("codigoInstrumento")
+    ?.addEventListener("input", (e) => {
+      const texto = e.target.value.trim();
+      clearTimeout(sugerenciasTimer);
+      if (texto.length < 2) return;
+      sugerenciasTimer = setTimeout(() => cargarSugerencias(texto), 150);
+    });
+
   document
     .getElementById("codigoInstrumento")
     ?.addEventListener("keypress", (e) => {
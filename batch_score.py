@@ -0,0 +1,179 @@
+"""
+Scoring offline: recorre 'historicos', calcula features, predice en lotes
+y escribe prediccion_ia / fecha_estimada de vuelta en Supabase.
+
+Uso:
+    python batch_score.py                          # escribe en Supabase (reanuda desde el checkpoint)
+    python batch_score.py --reset                  # ignora el checkpoint y empieza de cero
+    python batch_score.py --dry-run salida.parquet # no escribe en Supabase, guarda un Parquet
+
+El dry-run necesita pyarrow, que no está en requirements.txt (no se usa en la web):
+    pip install pyarrow
+"""
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from app.repositories.supabase_repository import SupabaseRepository
+from app.services.prediction_service import PredictionService
+from app.services.feature_engineering import FeatureEngineering
+
+CHECKPOINT_DEFAULT = ".batch_score_checkpoint.json"
+
+# Columnas del Parquet del dry-run: lo que se escribiría más lo necesario para identificar la fila
+COLUMNAS_PARQUET = [
+    ('id', 'int64'),
+    ('codigo', 'string'),
+    ('instrumento', 'string'),
+    ('fecha_calibracion', 'string'),
+    ('prediccion_ia', 'int64'),
+    ('fecha_estimada', 'string'),
+]
+
+
+def leer_checkpoint(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def guardar_checkpoint(path, ultimo_codigo, procesados):
+    # Escritura atómica: si el proceso muere, el checkpoint anterior sigue siendo válido
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({
+            "ultimo_codigo": ultimo_codigo,
+            "procesados": procesados,
+            "actualizado": datetime.now().isoformat()
+        }, f)
+    os.replace(tmp, path)
+
+
+class EscritorParquet:
+    """Escribe el Parquet del dry-run lote a lote, sin acumular todas las filas en memoria."""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("El dry-run necesita pyarrow: pip install pyarrow")
+
+        self.pa = pa
+        self.schema = pa.schema([(nombre, getattr(pa, tipo)()) for nombre, tipo in COLUMNAS_PARQUET])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def escribir(self, filas):
+        if not filas:
+            return
+        datos = [{nombre: fila.get(nombre) for nombre, _ in COLUMNAS_PARQUET} for fila in filas]
+        for fila in datos:
+            fila['fecha_calibracion'] = str(fila['fecha_calibracion']) if fila['fecha_calibracion'] is not None else None
+        self.writer.write_table(self.pa.Table.from_pylist(datos, schema=self.schema))
+
+    def cerrar(self):
+        self.writer.close()
+
+
+def lotes_por_instrumento(paginas, batch_size):
+    """
+    Agrupa las páginas del repositorio en lotes de ~batch_size filas sin partir
+    el historial de un instrumento (los lags dependen de la calibración previa).
+    """
+    buffer = []
+    for rows in paginas:
+        buffer.extend(rows)
+        if len(buffer) < batch_size:
+            continue
+
+        ultimo = buffer[-1]['codigo']
+        corte = len(buffer)
+        while corte > 0 and buffer[corte - 1]['codigo'] == ultimo:
+            corte -= 1
+        if corte == 0:
+            continue  # Un solo instrumento ocupa todo el buffer: seguir acumulando
+
+        yield buffer[:corte]
+        buffer = buffer[corte:]
+
+    if buffer:
+        yield buffer
+
+
+def puntuar_lote(rows, prediction_service):
+    """Devuelve las filas originales con prediccion_ia y fecha_estimada calculadas."""
+    df = FeatureEngineering.preparar_dataframe_dashboard(rows)
+    if df.empty:
+        return []
+
+    # Misma numeración que la reconstrucción histórica del laboratorio (1, 2, 3...)
+    df['num_calibraciones'] = df.groupby('id_agrupacion').cumcount() + 1
+    df['prediccion_ia'] = prediction_service.predict_batch(df)
+
+    filas = []
+    for idx, pred, fecha in zip(df.index, df['prediccion_ia'], df['fecha_calibracion']):
+        # predict_batch devuelve 0 si falló (el mínimo válido es 30 días)
+        if pred <= 0:
+            continue
+        fila = dict(rows[idx])
+        fila['prediccion_ia'] = int(pred)
+        fila['fecha_estimada'] = (fecha + timedelta(days=int(pred))).date().isoformat()
+        filas.append(fila)
+    return filas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scoring masivo de 'historicos' con el modelo de regresión")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Filas por lote de predicción")
+    parser.add_argument("--page-size", type=int, default=1000, help="Filas por página leída de Supabase")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Filas por UPDATE masivo")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_DEFAULT, help="Archivo de checkpoint para reanudar")
+    parser.add_argument("--reset", action="store_true", help="Ignorar el checkpoint existente")
+    parser.add_argument("--dry-run", metavar="PARQUET", help="No escribir en Supabase; guardar resultados en este Parquet")
+    args = parser.parse_args()
+
+    load_dotenv()
+    repository = SupabaseRepository()
+    prediction_service = PredictionService()
+
+    # El dry-run siempre recorre toda la tabla y no toca el checkpoint
+    checkpoint = {} if args.reset or args.dry_run else leer_checkpoint(args.checkpoint)
+    desde_codigo = checkpoint.get('ultimo_codigo')
+    procesados = checkpoint.get('procesados', 0)
+    if desde_codigo:
+        print(f"↻ Reanudando después de {desde_codigo} ({procesados} filas ya procesadas)")
+
+    paginas = repository.iterar_historicos(desde_codigo=desde_codigo, batch_size=args.page_size)
+    escritor = EscritorParquet(args.dry_run) if args.dry_run else None
+
+    try:
+        for rows in lotes_por_instrumento(paginas, args.batch_size):
+            filas = puntuar_lote(rows, prediction_service)
+
+            if escritor:
+                escritor.escribir(filas)
+            else:
+                actualizadas = repository.guardar_predicciones(filas, chunk_size=args.chunk_size)
+                if actualizadas < len(filas):
+                    print(f"⚠ {len(filas) - actualizadas} filas ya no existen (borradas durante la ejecución)")
+                guardar_checkpoint(args.checkpoint, rows[-1]['codigo'], procesados + len(filas))
+
+            procesados += len(filas)
+            print(f"✓ Lote hasta {rows[-1]['codigo']}: {len(filas)}/{len(rows)} filas puntuadas (total {procesados})")
+    finally:
+        if escritor:
+            escritor.cerrar()
+
+    if args.dry_run:
+        print(f"✓ Dry-run: {procesados} predicciones guardadas en {args.dry_run}")
+    else:
+        # Pasada completa: la próxima ejecución vuelve a empezar desde el principio
+        if os.path.exists(args.checkpoint):
+            os.remove(args.checkpoint)
+        print(f"✓ Scoring completo: {procesados} filas actualizadas")
+
+
+if __name__ == "__main__":
+    main()
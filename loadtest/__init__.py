@@ -0,0 +1 @@
+# Arnés de pruebas de carga (Supabase falso + escenarios)
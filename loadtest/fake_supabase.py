@@ -0,0 +1,226 @@
+"""
+Servidor local que imita los endpoints REST de Supabase (PostgREST) usados por
+SupabaseRepository y dashboard.py, con datos sintéticos y latencia configurable.
+
+Uso independiente (luego apuntar SUPABASE_URL a http://127.0.0.1:54321):
+    python -m loadtest.fake_supabase --instrumentos 500 --latencia-ms 40
+"""
+import argparse
+import random
+import threading
+import time
+from datetime import date, timedelta
+from flask import Flask, request, jsonify
+
+# Clave con forma de JWT para que create_client la acepte
+FAKE_KEY = "fake.supabase.key"
+
+TIPOS = [
+    ("MAN", "Manómetro"),
+    ("VAC", "Vacuómetro"),
+    ("BAL", "Balanza Analítica"),
+    ("TER", "Termómetro Digital"),
+    ("PIE", "Pie De Rey"),
+    ("MIC", "Micrómetro Exterior"),
+]
+
+
+def generar_historicos(instrumentos=500, calibraciones=(3, 12), semilla=42):
+    """
+    Genera filas con el esquema de 'historicos': varias calibraciones por código,
+    separadas por intervalos de ~6 a 18 meses.
+    """
+    rnd = random.Random(semilla)
+    filas = []
+    for i in range(instrumentos):
+        prefijo, nombre = rnd.choice(TIPOS)
+        codigo = f"{prefijo}-{i:05d}"
+        marca_id = rnd.randint(1, 15)
+        periodicidad = rnd.choice([180, 365, 365, 730])
+        fecha = date(2015, 1, 1) + timedelta(days=rnd.randint(0, 1500))
+
+        for _ in range(rnd.randint(*calibraciones)):
+            filas.append({
+                'id': len(filas) + 1,
+                'codigo': codigo,
+                'instrumento': nombre if rnd.random() > 0.1 else f"  {nombre.lower()} ",
+                'tipo': prefijo,
+                'fecha_calibracion': fecha.isoformat(),
+                'periodicidad': periodicidad,
+                'temperatura': round(rnd.gauss(21, 1.5), 1),
+                'humedad': round(rnd.gauss(55, 8), 1),
+                'incertidumbre': round(abs(rnd.gauss(0.05, 0.02)), 4),
+                'marca_id': marca_id,
+                'prediccion_ia': None,
+                'fecha_estimada': None,
+            })
+            fecha += timedelta(days=rnd.randint(180, 540))
+    return filas
+
+
+def _valor(texto, referencia):
+    """Convierte el valor del filtro al tipo de la columna para comparar."""
+    if isinstance(referencia, (int, float)) and not isinstance(referencia, bool):
+        try:
+            return float(texto)
+        except ValueError:
+            return texto
+    return texto
+
+
+def _filtro(columna, expresion):
+    """Traduce 'eq.X', 'gt.X', 'not.is.null'... a un predicado sobre la fila."""
+    negado = expresion.startswith("not.")
+    if negado:
+        expresion = expresion[4:]
+    operador, _, argumento = expresion.partition(".")
+
+    def cumple(fila):
+        v = fila.get(columna)
+        if operador == "is":
+            resultado = v is None if argumento == "null" else str(v).lower() == argumento
+        elif v is None:
+            resultado = False
+        else:
+            a = _valor(argumento, v)
+            if operador == "eq": resultado = v == a
+            elif operador == "neq": resultado = v != a
+            elif operador == "gt": resultado = v > a
+            elif operador == "gte": resultado = v >= a
+            elif operador == "lt": resultado = v < a
+            elif operador == "lte": resultado = v <= a
+            elif operador == "in": resultado = str(v) in argumento.strip("()").split(",")
+            else: raise ValueError(f"Operador no soportado: {operador}")
+        return not resultado if negado else resultado
+
+    return cumple
+
+
+def _ordenar(filas, orden):
+    # Orden estable: aplicar las claves de la última a la primera
+    for parte in reversed([p for p in orden.split(",") if p]):
+        columna, *mods = parte.split(".")
+        desc = "desc" in mods
+        nulos_primero = "nullsfirst" in mods if ("nullsfirst" in mods or "nullslast" in mods) else desc
+        con_valor = [f for f in filas if f.get(columna) is not None]
+        sin_valor = [f for f in filas if f.get(columna) is None]
+        con_valor.sort(key=lambda f: f[columna], reverse=desc)
+        filas = sin_valor + con_valor if nulos_primero else con_valor + sin_valor
+    return filas
+
+
+def _error(mensaje, status=400):
+    return jsonify({"message": mensaje, "code": "PGRST000", "details": None, "hint": None}), status
+
+
+def crear_fake_supabase(tablas=None, latencia_ms=0.0, jitter_ms=0.0):
+    """
+    Crea la app Flask que responde en /rest/v1/<tabla>.
+    `tablas` es un dict nombre -> lista de filas (por defecto, 'historicos' sintético).
+    """
+    app = Flask(__name__)
+    tablas = tablas if tablas is not None else {'historicos': generar_historicos()}
+    lock = threading.Lock()
+    reservados = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+    @app.before_request
+    def inyectar_latencia():
+        espera = latencia_ms + (random.uniform(0, jitter_ms) if jitter_ms else 0)
+        if espera > 0:
+            time.sleep(espera / 1000)
+
+    @app.get("/rest/v1/<tabla>")
+    def seleccionar(tabla):
+        if tabla not in tablas:
+            return _error(f"relation \"public.{tabla}\" does not exist", 404)
+        try:
+            predicados = [
+                _filtro(col, expr)
+                for col in request.args if col not in reservados
+                for expr in request.args.getlist(col)
+            ]
+            with lock:
+                filas = [f for f in tablas[tabla] if all(p(f) for p in predicados)]
+
+            filas = _ordenar(filas, ",".join(request.args.getlist("order")))
+
+            offset = int(request.args.get("offset", 0))
+            limit = request.args.get("limit", type=int)
+            rango = request.headers.get("Range")
+            if rango:
+                inicio, _, fin = rango.partition("-")
+                offset, limit = int(inicio), int(fin) - int(inicio) + 1
+            filas = filas[offset:offset + limit if limit is not None else None]
+
+            columnas = [c for c in request.args.get("select", "*").replace(" ", "").split(",") if c]
+            if "*" not in columnas:
+                filas = [{c: f.get(c) for c in columnas} for f in filas]
+            return jsonify(filas)
+
+        except ValueError as e:
+            return _error(str(e))
+
+    @app.post("/rest/v1/<tabla>")
+    def insertar(tabla):
+        """Insert/upsert: con 'resolution=merge-duplicates' fusiona por 'id' (o on_conflict)."""
+        filas_nuevas = request.get_json()
+        if isinstance(filas_nuevas, dict):
+            filas_nuevas = [filas_nuevas]
+        clave = request.args.get("on_conflict", "id")
+        fusionar = "merge-duplicates" in request.headers.get("Prefer", "")
+
+        with lock:
+            filas = tablas.setdefault(tabla, [])
+            por_clave = {f.get(clave): f for f in filas}
+            resultado = []
+            for nueva in filas_nuevas:
+                existente = por_clave.get(nueva.get(clave))
+                if existente is not None and fusionar:
+                    existente.update(nueva)
+                    resultado.append(existente)
+                elif existente is not None:
+                    return _error(f"duplicate key value violates unique constraint on \"{clave}\"", 409)
+                else:
+                    fila = dict(nueva)
+                    fila.setdefault('id', len(filas) + 1)
+                    filas.append(fila)
+                    por_clave[fila.get(clave)] = fila
+                    resultado.append(fila)
+        return jsonify(resultado), 201
+
+    @app.post("/rest/v1/rpc/actualizar_predicciones")
+    def actualizar_predicciones():
+        """Equivalente a sql/actualizar_predicciones.sql: UPDATE por id, ignora ids inexistentes."""
+        filas_nuevas = (request.get_json() or {}).get('filas', [])
+        with lock:
+            por_id = {f.get('id'): f for f in tablas.get('historicos', [])}
+            actualizadas = 0
+            for nueva in filas_nuevas:
+                existente = por_id.get(nueva.get('id'))
+                if existente is not None:
+                    existente['prediccion_ia'] = nueva.get('prediccion_ia')
+                    existente['fecha_estimada'] = nueva.get('fecha_estimada')
+                    actualizadas += 1
+        return jsonify(actualizadas)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Supabase/PostgREST falso con datos sintéticos")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--instrumentos", type=int, default=500)
+    parser.add_argument("--latencia-ms", type=float, default=0.0, help="Latencia fija añadida a cada consulta")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Latencia aleatoria adicional (0..jitter)")
+    parser.add_argument("--semilla", type=int, default=42)
+    args = parser.parse_args()
+
+    historicos = generar_historicos(args.instrumentos, semilla=args.semilla)
+    app = crear_fake_supabase({'historicos': historicos}, args.latencia_ms, args.jitter_ms)
+    print(f"✓ Supabase falso: {len(historicos)} filas en http://{args.host}:{args.port} (SUPABASE_KEY={FAKE_KEY})")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
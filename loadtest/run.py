@@ -0,0 +1,223 @@
+"""
+Pruebas de carga: levanta el Supabase falso y la app Flask como subprocesos y lanza
+escenarios contra /dashboard/data, /laboratorio/buscar y /api/predict.
+En este proceso solo quedan los hilos cliente, así no compiten por el GIL con
+el servidor medido y las latencias p95/p99 no salen infladas.
+
+Uso:
+    python -m loadtest.run --concurrencia 8 --peticiones 200 --latencia-ms 30
+    python -m loadtest.run --escenarios buscar,predict --instrumentos 2000
+    python -m loadtest.run --servidor gunicorn --workers 4
+"""
+import argparse
+import importlib.util
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from loadtest.fake_supabase import FAKE_KEY, generar_historicos
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def puerto_libre(host="127.0.0.1"):
+    with socket.socket() as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+def iniciar_proceso(nombre, comando, url_salud, env=None, timeout=120):
+    """
+    Lanza un servidor como subproceso (salida a un log temporal) y espera a que
+    `url_salud` responda. Devuelve (proceso, path_log).
+    """
+    log = tempfile.NamedTemporaryFile(prefix=f"loadtest-{nombre}-", suffix=".log", delete=False)
+    proceso = subprocess.Popen(comando, cwd=RAIZ, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if proceso.poll() is not None:
+            break
+        try:
+            requests.get(url_salud, timeout=2)
+            return proceso, log.name
+        except requests.RequestException:
+            time.sleep(0.3)
+
+    detener_proceso(proceso)
+    raise SystemExit(f"❌ {nombre} no arrancó; revisa {log.name}")
+
+
+def detener_proceso(proceso):
+    if proceso.poll() is None:
+        proceso.terminate()
+        try:
+            proceso.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proceso.kill()
+
+
+def escenario_dashboard(sesion, base_url, rnd, codigos):
+    return sesion.get(f"{base_url}/dashboard/data")
+
+
+def escenario_buscar(sesion, base_url, rnd, codigos):
+    return sesion.post(f"{base_url}/laboratorio/buscar", json={'codigo': rnd.choice(codigos)})
+
+
+def escenario_predict(sesion, base_url, rnd, codigos):
+    return sesion.post(f"{base_url}/api/predict", json={
+        'incertidumbre': round(rnd.uniform(0.01, 0.1), 4),
+        'temperatura': round(rnd.uniform(18, 25), 1),
+        'humedad': round(rnd.uniform(40, 70), 1),
+        'marca_id': rnd.randint(1, 15),
+        'num_calibraciones': rnd.randint(1, 12),
+        'edad_operacional': round(rnd.uniform(0, 120), 1),
+        'dias_desde_prev': rnd.randint(0, 540),
+        'mes': rnd.randint(1, 12)
+    })
+
+
+ESCENARIOS = {
+    'dashboard': escenario_dashboard,
+    'buscar': escenario_buscar,
+    'predict': escenario_predict,
+}
+
+
+def percentil(valores_ordenados, p):
+    if not valores_ordenados:
+        return 0.0
+    i = max(0, min(len(valores_ordenados) - 1, int(round(p / 100 * len(valores_ordenados))) - 1))
+    return valores_ordenados[i]
+
+
+def ejecutar_escenario(nombre, base_url, codigos, concurrencia, peticiones, semilla=0):
+    """Lanza `peticiones` llamadas con `concurrencia` hilos y devuelve las métricas."""
+    funcion = ESCENARIOS[nombre]
+    local = threading.local()
+    latencias = []
+    errores = []
+    lock = threading.Lock()
+
+    def una_peticion(n):
+        if not hasattr(local, 'sesion'):
+            local.sesion = requests.Session()
+        rnd = random.Random(semilla * 100003 + n)
+        inicio = time.perf_counter()
+        try:
+            r = funcion(local.sesion, base_url, rnd, codigos)
+            ok = r.status_code < 400
+            detalle = f"HTTP {r.status_code}"
+        except Exception as e:
+            ok, detalle = False, str(e)
+        ms = (time.perf_counter() - inicio) * 1000
+        with lock:
+            (latencias if ok else errores).append(ms if ok else detalle)
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+        list(pool.map(una_peticion, range(peticiones)))
+    duracion = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        'escenario': nombre,
+        'concurrencia': concurrencia,
+        'ok': len(latencias),
+        'errores': len(errores),
+        'primer_error': errores[0] if errores else None,
+        'p50': percentil(latencias, 50),
+        'p95': percentil(latencias, 95),
+        'p99': percentil(latencias, 99),
+        'throughput': len(latencias) / duracion if duracion else 0.0,
+    }
+
+
+def imprimir_reporte(resultados):
+    print(f"\n{'escenario':<12}{'conc':>6}{'ok':>7}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}")
+    for r in resultados:
+        print(f"{r['escenario']:<12}{r['concurrencia']:>6}{r['ok']:>7}{r['errores']:>6}"
+              f"{r['p50']:>10.1f}{r['p95']:>10.1f}{r['p99']:>10.1f}{r['throughput']:>9.1f}")
+        if r['primer_error']:
+            print(f"   ⚠ primer error: {r['primer_error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pruebas de carga contra un Supabase falso local")
+    parser.add_argument("--escenarios", default="dashboard,buscar,predict",
+                        help=f"Lista separada por comas: {', '.join(ESCENARIOS)}")
+    parser.add_argument("--concurrencia", type=int, default=4)
+    parser.add_argument("--peticiones", type=int, default=100, help="Peticiones por escenario")
+    parser.add_argument("--calentamiento", type=int, default=2, help="Peticiones previas no medidas por escenario")
+    parser.add_argument("--instrumentos", type=int, default=500)
+    parser.add_argument("--latencia-ms", type=float, default=0.0, help="Latencia fija del Supabase falso")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Latencia aleatoria adicional del Supabase falso")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--servidor", choices=["auto", "gunicorn", "flask"], default="auto",
+                        help="Servidor de la app (auto: gunicorn si está instalado)")
+    parser.add_argument("--workers", type=int, default=2, help="Workers de gunicorn")
+    args = parser.parse_args()
+
+    escenarios = [e.strip() for e in args.escenarios.split(",") if e.strip()]
+    desconocidos = [e for e in escenarios if e not in ESCENARIOS]
+    if desconocidos:
+        parser.error(f"Escenarios desconocidos: {', '.join(desconocidos)}")
+
+    host = "127.0.0.1"
+    procesos = []
+    try:
+        # 1. Supabase falso (subproceso; misma semilla para conocer los códigos aquí)
+        codigos = sorted({f['codigo'] for f in generar_historicos(args.instrumentos, semilla=args.semilla)})
+        fake_port = puerto_libre(host)
+        fake_url = f"http://{host}:{fake_port}"
+        fake, fake_log = iniciar_proceso("supabase", [
+            sys.executable, "-m", "loadtest.fake_supabase",
+            "--host", host, "--port", str(fake_port),
+            "--instrumentos", str(args.instrumentos), "--semilla", str(args.semilla),
+            "--latencia-ms", str(args.latencia_ms), "--jitter-ms", str(args.jitter_ms)
+        ], f"{fake_url}/rest/v1/historicos?select=id&limit=1")
+        procesos.append(fake)
+        print(f"✓ Supabase falso en {fake_url} ({len(codigos)} instrumentos, log: {fake_log})")
+
+        # 2. App real apuntando al falso
+        servidor = args.servidor
+        if servidor == "auto":
+            servidor = "gunicorn" if importlib.util.find_spec("gunicorn") else "flask"
+        app_port = puerto_libre(host)
+        app_url = f"http://{host}:{app_port}"
+        if servidor == "gunicorn":
+            comando = [sys.executable, "-m", "gunicorn", "wsgi:app", "--bind", f"{host}:{app_port}",
+                       "--workers", str(args.workers), "--timeout", "120"]
+        else:
+            comando = [sys.executable, "-m", "flask", "--app", "wsgi:app", "run",
+                       "--host", host, "--port", str(app_port), "--no-reload", "--no-debugger", "--with-threads"]
+        env = dict(os.environ, SUPABASE_URL=fake_url, SUPABASE_KEY=FAKE_KEY)
+        app, app_log = iniciar_proceso("app", comando, f"{app_url}/login", env=env)
+        procesos.append(app)
+        print(f"✓ App ({servidor}) en {app_url} (log: {app_log})")
+
+        # 3. Escenarios (solo hilos cliente en este proceso)
+        resultados = []
+        for nombre in escenarios:
+            if args.calentamiento:
+                ejecutar_escenario(nombre, app_url, codigos, 1, args.calentamiento, semilla=args.semilla + 1)
+            print(f"▶ {nombre}: {args.peticiones} peticiones, concurrencia {args.concurrencia}")
+            resultados.append(ejecutar_escenario(
+                nombre, app_url, codigos, args.concurrencia, args.peticiones, semilla=args.semilla
+            ))
+    finally:
+        for proceso in reversed(procesos):
+            detener_proceso(proceso)
+
+    imprimir_reporte(resultados)
+
+
+if __name__ == "__main__":
+    main()
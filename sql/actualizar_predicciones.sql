@@ -0,0 +1,18 @@
+-- Actualización masiva de predicciones usada por batch_score.py.
+-- Ejecutar una vez en el editor SQL de Supabase.
+-- UPDATE (no upsert): solo toca filas existentes, no exige valores para otras
+-- columnas NOT NULL y no recrea calibraciones borradas durante la ejecución.
+create or replace function public.actualizar_predicciones(filas jsonb)
+returns integer
+language sql
+as $$
+  with actualizadas as (
+    update public.historicos h
+       set prediccion_ia = f.prediccion_ia,
+           fecha_estimada = f.fecha_estimada
+      from jsonb_to_recordset(filas) as f(id bigint, prediccion_ia integer, fecha_estimada date)
+     where h.id = f.id
+    returning 1
+  )
+  select count(*)::integer from actualizadas;
+$$;